@@ -0,0 +1,121 @@
+import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from backend.services import limits, parse_pool
+from backend.services.pdf_parser import UnreadablePdf
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+# multipart boundaries + form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# One slot per parse process, so an admitted parse never waits in a pool queue
+_small_slots = asyncio.Semaphore(limits.SMALL_PARSE_SLOTS)
+_large_slots = asyncio.Semaphore(limits.LARGE_PARSE_SLOTS)
+# Requests currently waiting for (or just taking) a small slot
+_small_waiting = 0
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="parser busy, retry later or use background=true",
+        headers={"Retry-After": str(limits.RETRY_AFTER_SECONDS)},
+    )
+
+def check_capacity():
+    """Cheap 429 before the upload is hashed and stored, when the small-slot queue is already full."""
+    if _small_slots.locked() and _small_waiting >= limits.SMALL_SLOT_QUEUE:
+        raise _busy()
+
+@asynccontextmanager
+async def _small_slot():
+    # Small slots turn over quickly (a normal parse, or the page count of a
+    # large document), so wait up to SMALL_SLOT_WAIT_SECONDS for one, with at
+    # most SMALL_SLOT_QUEUE requests waiting, rather than 429 on a collision.
+    global _small_waiting
+    check_capacity()
+    _small_waiting += 1
+    try:
+        await asyncio.wait_for(_small_slots.acquire(), limits.SMALL_SLOT_WAIT_SECONDS)
+    except asyncio.TimeoutError:
+        raise _busy()
+    finally:
+        _small_waiting -= 1
+    try:
+        yield
+    finally:
+        _small_slots.release()
+
+async def run_parse(fn: Callable, path: str):
+    """
+    Run fn(path) in a parse process. Every document starts in a small slot,
+    whose process opens it and counts the pages (the web process never opens
+    an upload); one over LARGE_DOC_PAGES moves to the large slots, so a flood
+    of big PDFs holds small slots only for that page count and can't crowd
+    normal-sized syllabi out of the parser. A busy large slot is an immediate
+    429 + Retry-After; small slots wait briefly first (see _small_slot).
+    MAX_PAGES is enforced by parse_pages.
+    """
+    try:
+        async with _small_slot():
+            try:
+                return await parse_pool.run(False, parse_pool.run_if_small, fn, path)
+            except parse_pool.LargeDocument:
+                pass
+        if _large_slots.locked():
+            raise _busy()
+        async with _large_slots:
+            return await parse_pool.run(True, fn, path)
+    except limits.LimitExceeded as e:
+        raise too_large(e)
+    except UnreadablePdf:
+        raise HTTPException(status_code=422, detail="not a readable PDF")
+    except BrokenProcessPool:
+        raise HTTPException(status_code=422, detail="the parser crashed on this PDF")
+
+def too_large(e: limits.LimitExceeded) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"syllabus too large: {e}")
+
+class UploadSizeLimitMiddleware:
+    """
+    Cap POST bodies at the upload limit before they are spooled. A declared
+    Content-Length over the cap is rejected before anything is read. Bodies
+    without one (chunked transfer) are counted as they arrive, and the read
+    that crosses the cap raises 413, so form parsing stops right there
+    instead of spooling the rest of the upload to disk.
+    """
+
+    def __init__(self, app, max_bytes: int = limits.MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large(self) -> dict:
+        return {"detail": f"upload over {limits.MAX_UPLOAD_BYTES} bytes"}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            response = JSONResponse(self._too_large(), status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing as they are
+                    raise HTTPException(status_code=413, detail=self._too_large()["detail"],
+                                        headers={"Connection": "close"})
+            return message
+
+        await self.app(scope, counting_receive, send)
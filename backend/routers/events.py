@@ -0,0 +1,26 @@
+from backend.services import event_store
+from fastapi import APIRouter, HTTPException, Query
+from datetime import date, timedelta
+from typing import List, Optional
+
+router = APIRouter()
+
+# upper bound for ?days= (ten years)
+MAX_WINDOW_DAYS = 3660
+
+@router.get('/events')
+def events(course: List[str] = Query(...), type: Optional[List[str]] = Query(None),
+           start: Optional[date] = None, end: Optional[date] = None,
+           days: Optional[int] = Query(None, ge=0, le=MAX_WINDOW_DAYS)):
+    # e.g. /events?course=PHYS 110&course=MATH 22&type=EXAM&type=DUE&days=14
+    if days is not None:
+        start = start or date.today()
+        end = start + timedelta(days=days) if date.max - start > timedelta(days=days) else date.max
+    try:
+        return event_store.query_events(course, start and start.isoformat(), end and end.isoformat(), type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/meetings')
+def meetings(course: List[str] = Query(...)):
+    return event_store.query_meetings(course)
@@ -0,0 +1,11 @@
+from backend.services import job_queue
+from fastapi import APIRouter, HTTPException
+
+router = APIRouter()
+
+@router.get('/jobs/{job_id}')
+def get_job(job_id: str):
+    job = job_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
@@ -1,16 +1,34 @@
 from backend.services.pdf_parser import parse_file
-from fastapi import APIRouter, File, UploadFile, HTTPException
-import tempfile
+from backend.services import job_queue
+from backend.routers.upload import pinned_upload, upload_path, evicted
+from backend.routers.admission import check_capacity, run_parse
+from fastapi.concurrency import run_in_threadpool
+from fastapi import APIRouter, File, Form, UploadFile, HTTPException, Response
+from typing import Optional
 
 router = APIRouter()
 
 @router.post('/parse')
-async def parse(file: UploadFile = File(...)):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    contents = await file.read()
-    temp_file.write(contents)
-    temp_file.close()
+async def parse(response: Response, file: Optional[UploadFile] = File(None), sha256: Optional[str] = Form(None),
+                background: bool = False):
+    if not background:
+        check_capacity()
 
-    return parse_file(temp_file.name)
+    # either a fresh upload or the sha256 returned by an earlier /upload,
+    # pinned so eviction can't remove it while this request uses it
+    async with pinned_upload(file, sha256) as stored:
+        # background=true -> hand off to the worker pool, poll /jobs/{id} for the result
+        if background:
+            try:
+                job_id = await run_in_threadpool(job_queue.submit, "parse", stored.sha256, stored.size)
+            except KeyError:
+                raise evicted()
+            response.status_code = 202
+            return {"job_id": job_id, "status": "queued"}
 
-#good for now -> needs to extract dates and shit in the future tho
\ No newline at end of file
+        path = upload_path(stored.sha256)
+
+        # parse in a parse process, inside a parse slot (429 when they're all busy)
+        return await run_parse(parse_file, path)
+
+#good for now -> needs to extract dates and shit in the future tho
@@ -1,18 +1,41 @@
-from backend.services.pdf_parser import parse_file
-from backend.services.weekly_schedule import parse_class_schedule
-from fastapi import APIRouter, File, UploadFile, HTTPException
-import tempfile
+from backend.services.pipeline import parse_syllabus, index_syllabus
+from backend.services import job_queue
+from backend.routers.upload import pinned_upload, upload_path, evicted
+from backend.routers.admission import check_capacity, run_parse
+from fastapi.concurrency import run_in_threadpool
+from fastapi import APIRouter, File, Form, UploadFile, HTTPException, Response
+from dataclasses import asdict
+from typing import Optional
 
 router = APIRouter()
 
 @router.post('/weekly')
-async def parse(file: UploadFile = File(...)):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    contents = await file.read()
-    temp_file.write(contents)
-    temp_file.close()
+async def parse(response: Response, file: Optional[UploadFile] = File(None), sha256: Optional[str] = Form(None),
+                course: Optional[str] = Form(None), background: bool = False):
+    if not background:
+        check_capacity()
 
-    print("Extracted text:", parse_file(temp_file.name))
-    return parse_class_schedule(parse_file(temp_file.name))
+    # either a fresh upload or the sha256 returned by an earlier /upload,
+    # pinned so eviction can't remove it while this request uses it
+    async with pinned_upload(file, sha256) as stored:
+        # background=true -> hand off to the worker pool, poll /jobs/{id} for the result
+        if background:
+            try:
+                job_id = await run_in_threadpool(job_queue.submit, "weekly", stored.sha256, stored.size, course)
+            except KeyError:
+                raise evicted()
+            response.status_code = 202
+            return {"job_id": job_id, "status": "queued"}
 
-#good for now -> needs to extract dates w/ context in the future tho
\ No newline at end of file
+        path = upload_path(stored.sha256)
+
+        # parse in a parse process, inside a parse slot (429 when they're all busy);
+        # only pages whose text changed since an earlier upload get re-parsed
+        result = await run_parse(parse_syllabus, path)
+        # only with an explicit `course` do dates + meetings go to the event store
+        # (replacing that course's previous ones) for /events and /meetings
+        if course:
+            await run_in_threadpool(index_syllabus, result, course, stored.sha256)
+    return {**asdict(result.schedule), "course": course}
+
+#good for now -> needs to extract dates w/ context in the future tho
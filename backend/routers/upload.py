@@ -1,9 +1,63 @@
+from backend.services import limits, upload_store
+from backend.services.limits import LimitExceeded
+from fastapi.concurrency import run_in_threadpool
 from fastapi import APIRouter, File, UploadFile, HTTPException
+from contextlib import asynccontextmanager
+from typing import Optional
+import uuid
 
 router = APIRouter()
 
+def evicted() -> HTTPException:
+    return HTTPException(status_code=410, detail="upload was evicted from the store, upload it again")
+
+def _lookup(sha256: str, pin: Optional[str]) -> upload_store.StoredUpload:
+    if pin:
+        upload_store.store.pin(sha256, pin, upload_store.REQUEST_PIN_SECONDS)
+    return upload_store.StoredUpload(sha256=sha256, size=upload_store.store.size(sha256), deduplicated=True)
+
+async def stored_upload(file: Optional[UploadFile], sha256: Optional[str],
+                        pin: Optional[str] = None) -> upload_store.StoredUpload:
+    """
+    Save `file` to the upload store, or look up a previously uploaded `sha256`.
+    With `pin`, the blob is pinned for that owner (see pinned_upload).
+    """
+    if file is not None:
+        try:
+            return await run_in_threadpool(upload_store.store.put, file.file, limits.MAX_UPLOAD_BYTES,
+                                           pin, upload_store.REQUEST_PIN_SECONDS)
+        except LimitExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    if not sha256:
+        raise HTTPException(status_code=400, detail="send a file or the sha256 of an earlier upload")
+    sha256 = sha256.lower()
+    if not upload_store.is_sha256(sha256):
+        raise HTTPException(status_code=400, detail="sha256 must be 64 hex characters")
+    try:
+        return await run_in_threadpool(_lookup, sha256, pin)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="no upload with that sha256")
+
+@asynccontextmanager
+async def pinned_upload(file: Optional[UploadFile], sha256: Optional[str]):
+    """Like stored_upload, but the blob can't be evicted until the block exits."""
+    owner = f"request:{uuid.uuid4().hex}"
+    stored = await stored_upload(file, sha256, pin=owner)
+    try:
+        yield stored
+    finally:
+        await run_in_threadpool(upload_store.store.unpin, owner)
+
+def upload_path(sha256: str) -> str:
+    """Local path of a stored upload; 410 if it has been evicted."""
+    try:
+        return upload_store.store.local_path(sha256)
+    except KeyError:
+        raise evicted()
+
 @router.post('/upload')
 async def upload(file: UploadFile = File(...)):
-    return {"filename": file.filename}
+    stored = await stored_upload(file, None)
+    return {"filename": file.filename, "sha256": stored.sha256, "size": stored.size, "deduplicated": stored.deduplicated}
 
-#want to change this to upload and save in Supabase bucket
\ No newline at end of file
+#want to change this to upload and save in Supabase bucket -> implement UploadStore for it
@@ -1,4 +1,7 @@
 import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 import spacy
 from spacy.matcher import Matcher
 
@@ -152,9 +155,13 @@ def classify_context(window_text: str, start_char: int, end_char: int, k: int =
 
 
 
-def parse_dates(text: str):
+def parse_dates(text: str, skip_lines: int = 0):
+    # skip_lines: leading lines that are only there as context (prev/next line
+    # windows) and shouldn't produce results themselves
     lines, res = text.splitlines(), []
     for i, line in enumerate(lines):
+        if i < skip_lines:
+            continue
         prev_line = lines[i-1] if i-1 >= 0 else ""
         next_line = lines[i+1] if i+1 < len(lines) else ""
         window = f"{prev_line}\n{line}\n{next_line}"
@@ -171,10 +178,48 @@ def parse_dates(text: str):
                 "title": ctx.get("title"),
             })
 
+    return _dedupe_dates(res)
+
+def _dedupe_dates(items):
     # keep only with both context + type (your earlier filter)
     seen, final = set(), []
-    for it in res:
+    for it in items:
         key = (it["date_raw"], it["context"])
         if key not in seen:
             final.append(it); seen.add(key)
     return final
+
+# date_raw -> YYYY-MM-DD; formats mirror date_patterns (numeric dates read US-style)
+_ISO_FORMATS_WITH_YEAR = [
+    "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y",
+    "%m/%d/%Y", "%Y-%m-%d", "%Y.%m.%d", "%m-%d-%Y",
+]
+_ISO_FORMATS_NO_YEAR = ["%b %d", "%B %d", "%d %b", "%d %B", "%m/%d", "%m-%d"]
+
+@lru_cache(maxsize=65536)  # the same few hundred date strings recur across syllabi
+def to_iso_date(date_raw: str, default_year: Optional[int] = None) -> Optional[str]:
+    """
+    Normalize a `date_raw` from parse_dates to an ISO date. Dates without a
+    year use `default_year`; anything without a day ("Fall 2024") or that
+    doesn't parse returns None.
+    """
+    s = re.sub(r'(\d)(?:st|nd|rd|th)\b', r'\1', date_raw.strip(), flags=re.I)
+    s = re.sub(r'([A-Za-z])(\d)', r'\1 \2', s)         # "Sep9", "Sept9"
+    s = re.sub(r'\bsept\b', 'Sep', s.replace('.', ' ').replace(',', ' '), flags=re.I)
+    s = re.sub(r'\s+', ' ', s).strip()
+    if re.fullmatch(r'\d{4} \d{2} \d{2}', s):   # "2025.08.07" after dot stripping
+        s = s.replace(' ', '-')
+    for fmt in _ISO_FORMATS_WITH_YEAR:
+        try:
+            return datetime.strptime(s, fmt).date().isoformat()
+        except ValueError:
+            pass
+    if default_year is None:
+        return None
+    for fmt in _ISO_FORMATS_NO_YEAR:
+        try:
+            d = datetime.strptime(f"{s} {default_year}", f"{fmt} %Y").date()
+            return d.isoformat()
+        except ValueError:
+            pass
+    return None
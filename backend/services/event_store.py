@@ -0,0 +1,128 @@
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.services import sqlite_store
+from backend.services.date_parser import to_iso_date
+
+# ---------- Config ----------
+EVENT_DB_PATH = os.environ.get("SYLLABUS_EVENT_DB", "data/events.sqlite3")
+
+# (course, iso_date, type) serves "these courses, this window, these types"
+# straight off the index; meetings are small and looked up per course.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id        INTEGER PRIMARY KEY,
+    course    TEXT NOT NULL,
+    iso_date  TEXT NOT NULL,            -- YYYY-MM-DD
+    type      TEXT,                     -- EXAM | DUE | QUIZ | ... (matcher label)
+    title     TEXT,
+    context   TEXT,
+    date_raw  TEXT NOT NULL,
+    upload    TEXT                      -- sha256 of the source syllabus
+);
+CREATE INDEX IF NOT EXISTS events_course_date_type_idx ON events (course, iso_date, type);
+
+CREATE TABLE IF NOT EXISTS meetings (
+    id        INTEGER PRIMARY KEY,
+    course    TEXT NOT NULL,
+    days      TEXT NOT NULL,            -- "MO,WE,FR"
+    start_24h TEXT NOT NULL,
+    end_24h   TEXT NOT NULL,
+    location  TEXT,
+    kind      TEXT NOT NULL,
+    upload    TEXT
+);
+CREATE INDEX IF NOT EXISTS meetings_course_idx ON meetings (course);
+"""
+
+SQLITE_MAX_VARS = 500
+
+def _connect(db_path: str = EVENT_DB_PATH) -> sqlite3.Connection:
+    return sqlite_store.connect(db_path, SCHEMA)
+
+def _event_rows(course: str, dates: List[Dict[str, Any]], year: Optional[int], upload: Optional[str]):
+    for d in dates:
+        iso = to_iso_date(d["date_raw"], year)
+        if iso:
+            yield (course, iso, d.get("type"), d.get("title"), d.get("context"), d["date_raw"], upload)
+
+def _meeting_rows(course: str, meetings: List[Dict[str, Any]], upload: Optional[str]):
+    for m in meetings:
+        yield (course, ",".join(m["days"]), m["start_24h"], m["end_24h"], m.get("location"), m["kind"], upload)
+
+def replace_courses(items: Iterable[Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]], Optional[int], Optional[str]]],
+                    db_path: str = EVENT_DB_PATH) -> int:
+    """
+    Bulk load parsed syllabi in one transaction. Each item is
+    (course, parse_dates records, meeting dicts, default year, upload sha256);
+    whatever was stored for that course before is replaced.
+    Returns the number of events written.
+    """
+    conn = _connect(db_path)
+    written = 0
+    conn.execute("BEGIN")
+    try:
+        for course, dates, meetings, year, upload in items:
+            conn.execute("DELETE FROM events WHERE course = ?", (course,))
+            conn.execute("DELETE FROM meetings WHERE course = ?", (course,))
+            rows = list(_event_rows(course, dates, year, upload))
+            conn.executemany(
+                "INSERT INTO events (course, iso_date, type, title, context, date_raw, upload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO meetings (course, days, start_24h, end_24h, location, kind, upload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                _meeting_rows(course, meetings, upload),
+            )
+            written += len(rows)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return written
+
+def query_events(courses: List[str], start: Optional[str] = None, end: Optional[str] = None,
+                 types: Optional[List[str]] = None, db_path: str = EVENT_DB_PATH) -> List[Dict[str, Any]]:
+    """Events for `courses` with start <= iso_date <= end, optionally limited to `types`."""
+    if not courses:
+        return []
+    where, params = [], []
+    where.append(f"course IN ({','.join('?' * len(courses))})"); params.extend(courses)
+    if start:
+        where.append("iso_date >= ?"); params.append(start)
+    if end:
+        where.append("iso_date <= ?"); params.append(end)
+    if types:
+        where.append(f"type IN ({','.join('?' * len(types))})"); params.extend(t.upper() for t in types)
+    if len(params) > SQLITE_MAX_VARS:
+        raise ValueError("too many courses/types in one query")
+
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT course, iso_date, type, title, context, date_raw, upload FROM events "
+            f"WHERE {' AND '.join(where)} ORDER BY iso_date, course",
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(r) for r in rows]
+
+def query_meetings(courses: List[str], db_path: str = EVENT_DB_PATH) -> List[Dict[str, Any]]:
+    if not courses:
+        return []
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT course, days, start_24h, end_24h, location, kind FROM meetings "
+            f"WHERE course IN ({','.join('?' * len(courses))}) ORDER BY course, id",
+            courses,
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(r, days=r["days"].split(",") if r["days"] else []) for r in rows]
@@ -0,0 +1,261 @@
+# SQLite-backed job queue for background /parse and /weekly work.
+#
+# Web processes only insert rows (submit) and read them back (get_job). Jobs
+# run in one worker pool per node, started on its own:
+#
+#     python -m backend.services.job_queue
+#
+# The pool process warms the parsers and calls gc.freeze() before forking its
+# workers, so they all share one copy of the spaCy model. It also keeps
+# reaping: dead workers are replaced and their jobs requeued, up to
+# JOB_MAX_ATTEMPTS tries per job, and finished jobs are deleted after
+# JOB_RETENTION_SECONDS.
+import gc
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import time
+import uuid
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Set
+
+from backend.services import sqlite_store, upload_store
+from backend.services.pdf_parser import parse_file
+from backend.services.pipeline import parse_syllabus, index_syllabus
+
+# ---------- Config ----------
+JOB_DB_PATH = os.environ.get("SYLLABUS_JOB_DB", "data/jobs.sqlite3")
+JOB_WORKERS = int(os.environ.get("SYLLABUS_JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.environ.get("SYLLABUS_JOB_POLL_SECONDS", "0.25"))
+# A job whose worker dies this many times (e.g. a PDF that crashes MuPDF) is failed
+JOB_MAX_ATTEMPTS = int(os.environ.get("SYLLABUS_JOB_MAX_ATTEMPTS", "3"))
+JOB_REAP_SECONDS = float(os.environ.get("SYLLABUS_JOB_REAP_SECONDS", "1.0"))
+# Finished (done/failed) jobs, results included, are deleted this long after finishing
+JOB_RETENTION_SECONDS = float(os.environ.get("SYLLABUS_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+# Uploads at or under this size jump ahead of bigger ones in the queue
+SMALL_FILE_BYTES = int(os.environ.get("SYLLABUS_JOB_SMALL_FILE_BYTES", str(1024 * 1024)))
+
+PRIORITY_SMALL = 0
+PRIORITY_LARGE = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    status      TEXT NOT NULL,          -- queued | running | done | failed
+    priority    INTEGER NOT NULL,
+    upload      TEXT NOT NULL,          -- sha256 in the upload store
+    course      TEXT,                   -- event store key (weekly jobs submitted with one)
+    size        INTEGER NOT NULL,
+    pool_id     TEXT,                   -- run_pool instance that claimed it
+    worker_pid  INTEGER,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    result      TEXT,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim_idx ON jobs (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished_idx ON jobs (finished_at);
+"""
+
+# ---------- Tasks ----------
+def _run_parse(path: str, upload: str, course: Optional[str]):
+    return parse_file(path)
+
+def _run_weekly(path: str, upload: str, course: Optional[str]):
+    result = parse_syllabus(path)
+    if course:
+        index_syllabus(result, course, upload)
+    return {**asdict(result.schedule), "course": course}
+
+TASKS = {
+    "parse": _run_parse,
+    "weekly": _run_weekly,
+}
+
+# ---------- Store ----------
+def _pin_owner(job_id: str) -> str:
+    return f"job:{job_id}"
+
+def _connect(db_path: str = JOB_DB_PATH) -> sqlite3.Connection:
+    # autocommit mode; claims use explicit BEGIN IMMEDIATE
+    return sqlite_store.connect(db_path, SCHEMA)
+
+def requeue_orphans(pool_id: str, live_pids: Set[int], db_path: str = JOB_DB_PATH) -> int:
+    """
+    Put 'running' jobs whose worker is gone back into the queue, or fail them
+    once they have used up JOB_MAX_ATTEMPTS. A job is orphaned if another pool
+    instance claimed it (an earlier run: pids restart low in a container, so
+    its worker_pid may belong to a live process again) or if its worker isn't
+    one of this pool's live workers.
+    """
+    conn = _connect(db_path)
+    rows = conn.execute("SELECT id, pool_id, worker_pid, attempts FROM jobs WHERE status = 'running'").fetchall()
+    dead = [r for r in rows if r["pool_id"] != pool_id or r["worker_pid"] not in live_pids]
+    retry = [(r["id"],) for r in dead if r["attempts"] < JOB_MAX_ATTEMPTS]
+    give_up = [(f"worker died on each of {r['attempts']} attempts", time.time(), r["id"])
+               for r in dead if r["attempts"] >= JOB_MAX_ATTEMPTS]
+    conn.executemany(
+        "UPDATE jobs SET status = 'queued', worker_pid = NULL, started_at = NULL "
+        "WHERE id = ? AND status = 'running'",
+        retry,
+    )
+    conn.executemany(
+        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+        "WHERE id = ? AND status = 'running'",
+        give_up,
+    )
+    conn.close()
+    for _, _, job_id in give_up:
+        upload_store.store.unpin(_pin_owner(job_id))
+    return len(dead)
+
+def purge_finished(max_age: float = JOB_RETENTION_SECONDS, db_path: str = JOB_DB_PATH) -> int:
+    """Delete done/failed jobs that finished more than max_age seconds ago."""
+    conn = _connect(db_path)
+    try:
+        return conn.execute(
+            "DELETE FROM jobs WHERE finished_at < ? AND status IN ('done', 'failed')",
+            (time.time() - max_age,),
+        ).rowcount
+    finally:
+        conn.close()
+
+def submit(kind: str, sha256: str, size: int, course: Optional[str] = None,
+           db_path: str = JOB_DB_PATH) -> str:
+    """
+    Queue the stored upload `sha256` for the `kind` task and return the new job
+    id. The blob stays pinned until the job finishes; KeyError if it is gone.
+    """
+    if kind not in TASKS:
+        raise ValueError(f"unknown job kind: {kind}")
+    job_id = uuid.uuid4().hex
+    upload_store.store.pin(sha256, _pin_owner(job_id))
+    priority = PRIORITY_SMALL if size <= SMALL_FILE_BYTES else PRIORITY_LARGE
+    conn = _connect(db_path)
+    conn.execute(
+        "INSERT INTO jobs (id, kind, status, priority, upload, course, size, created_at) "
+        "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+        (job_id, kind, priority, sha256, course, size, time.time()),
+    )
+    conn.close()
+    return job_id
+
+def get_job(job_id: str, db_path: str = JOB_DB_PATH) -> Optional[Dict[str, Any]]:
+    conn = _connect(db_path)
+    row = conn.execute(
+        "SELECT id, kind, status, upload, course, size, attempts, result, error, created_at, started_at, finished_at "
+        "FROM jobs WHERE id = ?",
+        (job_id,),
+    ).fetchone()
+    conn.close()
+    if row is None:
+        return None
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    return job
+
+def _claim(conn: sqlite3.Connection, pool_id: str) -> Optional[sqlite3.Row]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT id, kind, upload, course FROM jobs WHERE status = 'queued' "
+            "ORDER BY priority, created_at LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', pool_id = ?, worker_pid = ?, started_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (pool_id, os.getpid(), time.time(), row["id"]),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+def _finish(conn: sqlite3.Connection, job_id: str, result=None, error: Optional[str] = None):
+    conn.execute(
+        "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+        (
+            "failed" if error else "done",
+            None if error else json.dumps(result),
+            error,
+            time.time(),
+            job_id,
+        ),
+    )
+    upload_store.store.unpin(_pin_owner(job_id))
+
+# ---------- Workers ----------
+# Set from SIGTERM/SIGINT. The handler must not touch stop_event: it runs on
+# the thread that may be blocked inside stop_event.wait() holding its lock.
+_stopping = False
+
+def _request_stop(*_):
+    global _stopping
+    _stopping = True
+
+def _worker_main(db_path: str, pool_id: str, stop_event):
+    conn = _connect(db_path)
+    while not (_stopping or stop_event.is_set()):
+        job = _claim(conn, pool_id)
+        if job is None:
+            stop_event.wait(JOB_POLL_SECONDS)
+            continue
+        try:
+            path = upload_store.store.local_path(job["upload"])
+        except KeyError:
+            # pinned at submit, so only if the store was wiped out from under us
+            _finish(conn, job["id"], error="upload was evicted before the job ran")
+            continue
+        try:
+            _finish(conn, job["id"], result=TASKS[job["kind"]](path, job["upload"], job["course"]))
+        except Exception as e:
+            _finish(conn, job["id"], error=f"{type(e).__name__}: {e}")
+    conn.close()
+
+def run_pool(n: int = JOB_WORKERS, db_path: str = JOB_DB_PATH):
+    """
+    Supervise n job workers until SIGTERM/SIGINT. Parsers are warmed and frozen
+    here, then workers are forked so they share those pages copy-on-write.
+    """
+    from backend.services.warmup import warm
+    warm()
+    gc.collect()
+    gc.freeze()
+
+    ctx = multiprocessing.get_context("fork")
+    stop_event = ctx.Event()
+    # inherited by the workers, which finish their current job and exit
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, _request_stop)
+
+    pool_id = uuid.uuid4().hex
+    workers = []
+    while not _stopping:
+        # Reaper: requeue (or fail) jobs left 'running' by any dead worker,
+        # including every one from a previous run of the pool, drop expired
+        # finished jobs, then top the pool up
+        workers = [p for p in workers if p.is_alive()]
+        requeue_orphans(pool_id, {p.pid for p in workers}, db_path)
+        purge_finished(db_path=db_path)
+        while len(workers) < n:
+            p = ctx.Process(target=_worker_main, args=(db_path, pool_id, stop_event), daemon=True)
+            p.start()
+            workers.append(p)
+        time.sleep(JOB_REAP_SECONDS)
+
+    stop_event.set()
+    for p in workers:
+        p.join(5.0)
+        if p.is_alive():
+            # still mid-job; the next pool requeues it
+            p.kill()
+
+if __name__ == "__main__":
+    run_pool()
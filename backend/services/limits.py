@@ -0,0 +1,25 @@
+import os
+
+# ---------- Config ----------
+# Per-request resource caps for the synchronous parse routes and the job workers.
+MAX_UPLOAD_BYTES = int(os.environ.get("SYLLABUS_MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+MAX_PAGES = int(os.environ.get("SYLLABUS_MAX_PAGES", "150"))
+MAX_TEXT_CHARS = int(os.environ.get("SYLLABUS_MAX_TEXT_CHARS", "1000000"))
+# Documents over this many pages count as large
+LARGE_DOC_PAGES = int(os.environ.get("SYLLABUS_LARGE_DOC_PAGES", "25"))
+# Parse processes per web process (see services.parse_pool). Every document
+# is opened and page-counted in a small slot; small ones are parsed there and
+# large ones move to a large slot. /parse and /weekly answer 429 when the
+# slot a request needs is busy.
+SMALL_PARSE_SLOTS = int(os.environ.get("SYLLABUS_SMALL_PARSE_SLOTS", "2"))
+LARGE_PARSE_SLOTS = int(os.environ.get("SYLLABUS_LARGE_PARSE_SLOTS", "1"))
+# How long, and how many requests at once, may wait for a small slot (held for
+# normal parses and for the page count of every large document) before 429
+SMALL_SLOT_WAIT_SECONDS = float(os.environ.get("SYLLABUS_SMALL_SLOT_WAIT_SECONDS", "0.5"))
+SMALL_SLOT_QUEUE = int(os.environ.get("SYLLABUS_SMALL_SLOT_QUEUE", "16"))
+# Large-document parse processes run at this nice level so they yield the CPU
+LARGE_PARSE_NICE = int(os.environ.get("SYLLABUS_LARGE_PARSE_NICE", "10"))
+RETRY_AFTER_SECONDS = int(os.environ.get("SYLLABUS_RETRY_AFTER_SECONDS", "5"))
+
+class LimitExceeded(ValueError):
+    """An upload or its extracted text is over one of the configured caps."""
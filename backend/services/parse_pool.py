@@ -0,0 +1,104 @@
+# Process pools for the synchronous /parse and /weekly routes.
+#
+# Parsing is CPU-bound Python (spaCy, regexes, MuPDF text extraction). On the
+# web process's threadpool every in-flight parse competes with the event loop
+# and with the other parses for the GIL, so one large PDF slows every normal
+# syllabus behind it. Each web process instead keeps two small pools of forked
+# parse processes: SMALL_PARSE_SLOTS for normal syllabi and LARGE_PARSE_SLOTS
+# for documents over LARGE_DOC_PAGES. The large pool runs at LARGE_PARSE_NICE,
+# so on a busy node the kernel hands the CPU to small parses and the web
+# process first. Uploads are only ever opened in these processes (see
+# run_if_small), so a PDF that crashes MuPDF can't take the web worker down.
+#
+# start() forks both pools up front, after a warm-up parse and gc.freeze(),
+# so they share the parser pages copy-on-write with the web process (and,
+# under gunicorn's preload_app, with the master).
+import asyncio
+import ctypes
+import gc
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict
+
+from backend.services import limits
+from backend.services.pdf_parser import page_count
+
+PR_SET_PDEATHSIG = 1
+
+class LargeDocument(Exception):
+    """run_if_small found more than LARGE_DOC_PAGES pages; parse in the large pool."""
+
+_pools: Dict[bool, ProcessPoolExecutor] = {}
+
+def _init_worker(parent_pid: int, nice: int):
+    # Die with the web process even if it is killed outright: an orphaned
+    # parse process would keep the inherited listening socket open.
+    try:
+        ctypes.CDLL(None).prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+    except (OSError, AttributeError):
+        pass    # not Linux; shutdown() still stops the pool on a clean exit
+    if os.getppid() != parent_pid:
+        os._exit(0)
+    if nice:
+        os.nice(nice)
+
+def _new_pool(large: bool) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=limits.LARGE_PARSE_SLOTS if large else limits.SMALL_PARSE_SLOTS,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(os.getpid(), limits.LARGE_PARSE_NICE if large else 0),
+    )
+
+def _pool(large: bool) -> ProcessPoolExecutor:
+    if large not in _pools:
+        _pools[large] = _new_pool(large)
+    return _pools[large]
+
+def start():
+    """Warm the parsers and fork both pools now rather than on the first request."""
+    from backend.services.warmup import warm
+    warm()
+    gc.collect()
+    gc.freeze()
+    for large in (False, True):
+        # with the fork context the first submit starts every process in the pool
+        _pool(large).submit(os.getpid).result()
+
+def shutdown():
+    # join the parse processes before the web process exits
+    for pool in _pools.values():
+        pool.shutdown(wait=True, cancel_futures=True)
+    _pools.clear()
+
+def run_if_small(fn: Callable, path: str):
+    """
+    fn(path), unless the PDF has more than LARGE_DOC_PAGES pages. Runs in a
+    small-pool process, so even opening an unknown upload happens outside the
+    web process.
+    """
+    pages = page_count(path)
+    if pages > limits.LARGE_DOC_PAGES:
+        raise LargeDocument(pages)
+    return fn(path)
+
+async def run(large: bool, fn: Callable, *args):
+    """
+    Run fn(*args) in the small or large pool. Callers bound the number of
+    calls in flight to the pool size, so nothing queues in the executor.
+    A parse process that died (e.g. MuPDF crashing on a malformed PDF) breaks
+    its pool; the pool is replaced and the call retried once, so only a PDF
+    that crashes the parser twice gets BrokenProcessPool.
+    """
+    for attempt in range(2):
+        pool = _pool(large)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            if _pools.get(large) is pool:
+                _pools[large] = _new_pool(large)
+            if attempt:
+                raise
@@ -1,16 +1,42 @@
 import fitz
+from backend.services.limits import MAX_PAGES, MAX_TEXT_CHARS, LimitExceeded
+
+class UnreadablePdf(ValueError):
+    """The upload isn't a PDF that MuPDF can open."""
+
+def _open(my_path: str):
+    try:
+        return fitz.open(my_path)
+    except fitz.FileDataError as e:
+        raise UnreadablePdf(str(e)) from None
 
 #extracts text from uploaded files
 def parse_file(my_path: str):
-    doc = fitz.open(my_path)
+    return "".join(parse_pages(my_path))
+
+#page count only, no text extraction (cheap enough for admission checks)
+def page_count(my_path: str) -> int:
+    with _open(my_path) as doc:
+        return doc.page_count
 
-    res = ""
+#same text, one string per page (incremental re-parse keys off these)
+#stops early with LimitExceeded instead of extracting a huge/scanned doc in full
+def parse_pages(my_path: str, max_pages: int = MAX_PAGES, max_chars: int = MAX_TEXT_CHARS):
+    doc = _open(my_path)
 
-    for page in doc:
-        blocks = page.get_text("blocks")
-        for b in blocks:
-            res += b[4]  # b[4] contains the text
+    pages = []
+    total = 0
 
-    print(res)
-        
-    return res
\ No newline at end of file
+    try:
+        if doc.page_count > max_pages:
+            raise LimitExceeded(f"{doc.page_count} pages (limit {max_pages})")
+        for page in doc:
+            blocks = page.get_text("blocks")
+            text = "".join(b[4] for b in blocks)  # b[4] contains the text
+            total += len(text)
+            if total > max_chars:
+                raise LimitExceeded(f"more than {max_chars} characters of text")
+            pages.append(text)
+    finally:
+        doc.close()
+    return pages
\ No newline at end of file
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.services import event_store, sqlite_store
+from backend.services.date_parser import parse_dates, _dedupe_dates
+from backend.services.pdf_parser import parse_pages
+from backend.services.weekly_schedule import (
+    TERM_RE,
+    CONTEXT_WINDOW_CHARS,
+    CourseSchedule,
+    Meeting,
+    _dedupe_meetings,
+    _guess_course_name,
+    _parse_meetings,
+    normalize_text,
+)
+
+# ---------- Config ----------
+PAGE_CACHE_DB_PATH = os.environ.get("SYLLABUS_PAGE_CACHE_DB", "data/pages.sqlite3")
+PAGE_CACHE_MAX_ROWS = int(os.environ.get("SYLLABUS_PAGE_CACHE_MAX_ROWS", "200000"))
+SQLITE_MAX_VARS = 500
+# Part of every page fingerprint. Bump it whenever date_parser or
+# weekly_schedule change what they extract, so cached pages are re-parsed
+# instead of serving results from the old parser.
+PARSER_VERSION = "2"
+
+# Per-page partial results, keyed by a fingerprint of the page text plus the
+# tail of the page before it (see _page_context). A revised syllabus shares the
+# fingerprints of every page that did not change, so only edited pages (and a
+# page whose predecessor's tail was edited) go through spaCy and the schedule
+# regexes again.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    fingerprint TEXT PRIMARY KEY,       -- sha256 of PARSER_VERSION + page text
+    dates       TEXT NOT NULL,          -- json: parse_dates(page)
+    meetings    TEXT NOT NULL,          -- json: [asdict(Meeting), ...]
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_used_idx ON pages (last_used);
+"""
+
+@dataclass
+class SyllabusParse:
+    schedule: CourseSchedule
+    dates: List[Dict[str, Any]]
+    page_count: int
+    reparsed_pages: List[int]     # 0-based indexes of pages that missed the cache
+    year: Optional[int] = None    # default year for dates written without one
+
+# ---------- Page cache ----------
+def page_fingerprint(page_text: str, context: str = "") -> str:
+    key = f"{PARSER_VERSION}\0{context}\0{page_text}"
+    return hashlib.sha256(key.encode("utf-8", "surrogatepass")).hexdigest()
+
+def _connect(db_path: str = PAGE_CACHE_DB_PATH) -> sqlite3.Connection:
+    return sqlite_store.connect(db_path, SCHEMA)
+
+def _load_cached(conn: sqlite3.Connection, fingerprints: List[str]) -> Dict[str, Tuple[list, list]]:
+    out = {}
+    uniq = list(dict.fromkeys(fingerprints))
+    for i in range(0, len(uniq), SQLITE_MAX_VARS):
+        chunk = uniq[i:i + SQLITE_MAX_VARS]
+        marks = ",".join("?" * len(chunk))
+        for row in conn.execute(
+            f"SELECT fingerprint, dates, meetings FROM pages WHERE fingerprint IN ({marks})", chunk
+        ):
+            out[row["fingerprint"]] = (json.loads(row["dates"]), json.loads(row["meetings"]))
+    return out
+
+def _store(conn: sqlite3.Connection, new_rows: List[Tuple[str, list, list]], hits: List[str]):
+    now = time.time()
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO pages (fingerprint, dates, meetings, last_used) VALUES (?, ?, ?, ?)",
+            [(fp, json.dumps(d), json.dumps(m), now) for fp, d, m in new_rows],
+        )
+        conn.executemany("UPDATE pages SET last_used = ? WHERE fingerprint = ?", [(now, fp) for fp in hits])
+        if new_rows:
+            # Trim least-recently-used pages once the cache outgrows its cap
+            extra = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] - PAGE_CACHE_MAX_ROWS
+            if extra > 0:
+                conn.execute(
+                    "DELETE FROM pages WHERE fingerprint IN "
+                    "(SELECT fingerprint FROM pages ORDER BY last_used LIMIT ?)",
+                    (extra,),
+                )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+def _page_context(prev_page: str) -> str:
+    """
+    Whole trailing lines of the previous page covering at least
+    CONTEXT_WINDOW_CHARS, i.e. the same lookback a whole-document parse gives
+    the first lines of this page (prev-line date windows, office-hours context,
+    section headers such as "Office Hours:" right before the break).
+    """
+    if len(prev_page) <= CONTEXT_WINDOW_CHARS:
+        return prev_page
+    cut = prev_page.rfind("\n", 0, len(prev_page) - CONTEXT_WINDOW_CHARS) + 1
+    return prev_page[cut:]
+
+def _parse_page(page_text: str, context: str) -> Tuple[list, list]:
+    # context comes first so windows/spans reach back into it, but only
+    # results that start on this page are kept
+    dates = parse_dates(context + page_text, skip_lines=context.count("\n"))
+    norm_context = normalize_text(context)
+    meetings = _parse_meetings(norm_context + normalize_text(page_text), min_pos=len(norm_context))
+    return dates, [asdict(m) for m in meetings]
+
+# ---------- Pipeline ----------
+def parse_pages_incremental(pages: List[str], db_path: str = PAGE_CACHE_DB_PATH) -> SyllabusParse:
+    """
+    parse_dates + parse_class_schedule over a list of page texts, reusing cached
+    per-page results for any page whose text has been seen before.
+
+    Each page is parsed with the tail of the previous page as read-only
+    context, so section headers and the CONTEXT_WINDOW_CHARS lookback still
+    reach across a page break. What still differs from a whole-document parse:
+    a header further back than that tail, and look-ahead past the end of a
+    page (the next-line date window, a days line whose time is on the next
+    page). Results are merged in page order with the same dedupe rules as a
+    whole-document parse: (date_raw, context) for dates and _dedupe_meetings
+    for meetings.
+    """
+    contexts = [""] + [_page_context(p) for p in pages[:-1]]
+    fingerprints = [page_fingerprint(p, c) for p, c in zip(pages, contexts)]
+
+    conn = _connect(db_path)
+    try:
+        cached = _load_cached(conn, fingerprints)
+        hits = list(cached)
+        new_rows, reparsed = [], []
+        for i, (fp, text, context) in enumerate(zip(fingerprints, pages, contexts)):
+            if fp in cached:
+                continue
+            dates, meetings = _parse_page(text, context)
+            cached[fp] = (dates, meetings)
+            new_rows.append((fp, dates, meetings))
+            reparsed.append(i)
+        _store(conn, new_rows, hits)
+    finally:
+        conn.close()
+
+    all_dates, all_meetings = [], []
+    for fp in fingerprints:
+        dates, meetings = cached[fp]
+        all_dates.extend(dates)
+        all_meetings.extend(Meeting(**m) for m in meetings)
+
+    # Course name and year only look at the top of the document; cheap to redo each time
+    text = normalize_text("".join(pages))
+    dates = _dedupe_dates(all_dates)
+    return SyllabusParse(
+        schedule=CourseSchedule(course_name=_guess_course_name(text), meetings=_dedupe_meetings(all_meetings)),
+        dates=dates,
+        page_count=len(pages),
+        reparsed_pages=reparsed,
+        year=guess_year(text, dates),
+    )
+
+def guess_year(text: str, dates: List[Dict[str, Any]]) -> Optional[int]:
+    """Year for dates like "Sept 9": the term heading if present, else the most common explicit year."""
+    m = TERM_RE.search(text)
+    if m:
+        return int(m.group(0)[-4:])
+    years = Counter(y for d in dates for y in re.findall(r'\b(20\d{2})\b', d["date_raw"]))
+    return int(years.most_common(1)[0][0]) if years else None
+
+def parse_syllabus(path: str, db_path: str = PAGE_CACHE_DB_PATH) -> SyllabusParse:
+    return parse_pages_incremental(parse_pages(path), db_path)
+
+def index_syllabus(result: SyllabusParse, course: str, upload: Optional[str] = None) -> str:
+    """
+    Write a parse into the event store under `course`, replacing whatever that
+    course had before, and return the key. The key always comes from the
+    caller: a guessed one would let a second section's syllabus silently
+    replace the first's.
+    """
+    if not course:
+        raise ValueError("index_syllabus needs an explicit course key")
+    event_store.replace_courses([
+        (course, result.dates, [asdict(m) for m in result.schedule.meetings], result.year, upload),
+    ])
+    return course
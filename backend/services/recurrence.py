@@ -0,0 +1,167 @@
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from backend.services.weekly_schedule import CourseSchedule, Meeting, meetings_to_rrule
+
+DateLike = Union[date, str, np.datetime64]
+
+# RFC 5545 BYDAY codes in numpy weekday order (Monday = 0)
+BYDAY_INDEX = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+# ---------- Date helpers ----------
+def _day(d: DateLike) -> np.datetime64:
+    return np.datetime64(d, "D")
+
+@lru_cache(maxsize=4096)
+def _minutes(hhmm: str) -> int:
+    h, m = map(int, hhmm.split(":"))
+    return h * 60 + m
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday (3)
+    return (days.astype(np.int64) + 3) % 7
+
+@lru_cache(maxsize=256)
+def _day_mask(days: Tuple[str, ...]) -> int:
+    mask = 0
+    for d in days:
+        if d in BYDAY_INDEX:
+            mask |= 1 << BYDAY_INDEX[d]
+    return mask
+
+def excluded_days(holidays: Iterable[DateLike] = (),
+                  breaks: Iterable[Tuple[DateLike, DateLike]] = ()) -> np.ndarray:
+    """Sorted unique datetime64[D] array of single holidays plus inclusive (start, end) breaks."""
+    parts = [np.array([_day(h) for h in holidays], dtype="datetime64[D]")]
+    for start, end in breaks:
+        parts.append(np.arange(_day(start), _day(end) + 1, dtype="datetime64[D]"))
+    return np.unique(np.concatenate(parts))
+
+class TermCalendar:
+    """
+    Every teaching day of a term, precomputed once: the term's dates with
+    holidays and breaks removed, plus a weekday bit per date. Expanding a
+    meeting is then a single mask over this array, so one calendar can be
+    reused across a whole catalog.
+    """
+
+    def __init__(self, term_start: DateLike, term_end: DateLike,
+                 holidays: Iterable[DateLike] = (),
+                 breaks: Iterable[Tuple[DateLike, DateLike]] = ()):
+        self.start = _day(term_start)
+        self.end = _day(term_end)
+        self.excluded = excluded_days(holidays, breaks)
+        all_days = np.arange(self.start, self.end + 1, dtype="datetime64[D]")
+        self.days = all_days[~np.isin(all_days, self.excluded)]
+        self.day_bits = np.left_shift(1, _weekday(self.days))
+        self._by_mask: Dict[int, np.ndarray] = {}
+
+    def dates_for(self, days: Sequence[str]) -> np.ndarray:
+        """Teaching dates that fall on any of the BYDAY codes in `days`."""
+        mask = _day_mask(tuple(days))
+        if mask not in self._by_mask:
+            self._by_mask[mask] = self.days[(self.day_bits & mask) != 0]
+        return self._by_mask[mask]
+
+    def exdates_for(self, days: Sequence[str]) -> np.ndarray:
+        """Excluded dates inside the term that the weekly rule would otherwise hit."""
+        ex = self.excluded[(self.excluded >= self.start) & (self.excluded <= self.end)]
+        return ex[(np.left_shift(1, _weekday(ex)) & _day_mask(tuple(days))) != 0]
+
+# ---------- Expansion ----------
+def expand_meeting(meet: Meeting, cal: TermCalendar) -> Tuple[np.ndarray, np.ndarray]:
+    """(starts, ends) as datetime64[m] arrays, one entry per occurrence of `meet`."""
+    dates = cal.dates_for(meet.days).astype("datetime64[m]")
+    return (dates + np.timedelta64(_minutes(meet.start_24h), "m"),
+            dates + np.timedelta64(_minutes(meet.end_24h), "m"))
+
+def expand_schedule(schedule: CourseSchedule, term_start: DateLike, term_end: DateLike,
+                    holidays: Iterable[DateLike] = (),
+                    breaks: Iterable[Tuple[DateLike, DateLike]] = ()) -> List[Dict[str, Any]]:
+    """
+    Concrete occurrences of every meeting in `schedule` between term_start and
+    term_end (inclusive), skipping holidays and breaks, sorted by start time.
+    """
+    cal = TermCalendar(term_start, term_end, holidays, breaks)
+    out = []
+    for idx, meet in enumerate(schedule.meetings):
+        starts, ends = expand_meeting(meet, cal)
+        for s, e in zip(starts.astype(str), ends.astype(str)):
+            out.append({
+                "meeting_index": idx,
+                "kind": meet.kind,
+                "location": meet.location,
+                "start": f"{s}:00",
+                "end": f"{e}:00",
+            })
+    out.sort(key=lambda o: o["start"])
+    return out
+
+def expand_catalog(schedules: Sequence[CourseSchedule], term_start: DateLike, term_end: DateLike,
+                   holidays: Iterable[DateLike] = (),
+                   breaks: Iterable[Tuple[DateLike, DateLike]] = ()) -> Dict[str, np.ndarray]:
+    """
+    Columnar expansion of many schedules sharing one term calendar.
+
+    Meetings are grouped by their weekday mask (MWF, TuTh, ... there are only a
+    handful in practice) and each group is expanded with one broadcast add of
+    (meeting start offsets) x (teaching dates). Returns parallel arrays:
+    course, meeting (index within its schedule), start, end (datetime64[m]).
+    """
+    cal = TermCalendar(term_start, term_end, holidays, breaks)
+
+    # Only the per-meeting bookkeeping runs in Python; the masks and minute
+    # offsets repeat across a catalog and come out of the lru caches.
+    groups: Dict[int, List[Tuple[int, int, int, int]]] = {}
+    for ci, sched in enumerate(schedules):
+        for mi, meet in enumerate(sched.meetings):
+            groups.setdefault(_day_mask(tuple(meet.days)), []).append(
+                (ci, mi, _minutes(meet.start_24h), _minutes(meet.end_24h)))
+
+    course, meeting, starts, ends = [], [], [], []
+    for mask, rows in groups.items():
+        dates = cal.days[(cal.day_bits & mask) != 0].astype("datetime64[m]")
+        if not len(dates):
+            continue
+        rows = np.array(rows, dtype=np.int64)
+        n = len(dates)
+        course.append(np.repeat(rows[:, 0], n))
+        meeting.append(np.repeat(rows[:, 1], n))
+        starts.append((dates[None, :] + rows[:, 2, None].astype("timedelta64[m]")).ravel())
+        ends.append((dates[None, :] + rows[:, 3, None].astype("timedelta64[m]")).ravel())
+
+    if not course:
+        empty_i = np.empty(0, dtype=np.int64)
+        empty_t = np.empty(0, dtype="datetime64[m]")
+        return {"course": empty_i, "meeting": empty_i, "start": empty_t, "end": empty_t}
+    return {
+        "course": np.concatenate(course),
+        "meeting": np.concatenate(meeting),
+        "start": np.concatenate(starts),
+        "end": np.concatenate(ends),
+    }
+
+# ---------- RRULE ----------
+def meeting_recurrence(meet: Meeting, term_start: DateLike, term_end: DateLike,
+                       holidays: Iterable[DateLike] = (),
+                       breaks: Iterable[Tuple[DateLike, DateLike]] = (),
+                       cal: Optional[TermCalendar] = None) -> Optional[Dict[str, Any]]:
+    """
+    Google Calendar / ICS friendly event for one meeting across the term:
+    DTSTART on the first real occurrence, UNTIL at the end of term_end and an
+    EXDATE for each holiday/break day the weekly rule would otherwise hit.
+    Returns None if the meeting never occurs in the term.
+    """
+    cal = cal or TermCalendar(term_start, term_end, holidays, breaks)
+    dates = cal.dates_for(meet.days)
+    if not len(dates):
+        return None
+    return meetings_to_rrule(
+        meet,
+        str(dates[0]),
+        until_ymd=str(cal.end),
+        exdates_ymd=[str(d) for d in cal.exdates_for(meet.days) if d > dates[0]],
+    )
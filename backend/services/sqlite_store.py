@@ -0,0 +1,20 @@
+import os
+import sqlite3
+
+_initialized = set()
+
+def connect(db_path: str, schema: str) -> sqlite3.Connection:
+    """
+    Open a WAL-mode SQLite connection in autocommit mode (callers issue an
+    explicit BEGIN for multi-statement transactions) and create `schema` the
+    first time this process touches `db_path`.
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if db_path not in _initialized:
+        conn.executescript(schema)
+        _initialized.add(db_path)
+    return conn
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from backend.services import sqlite_store
+from backend.services.limits import LimitExceeded
+
+# ---------- Config ----------
+UPLOAD_DIR = os.environ.get("SYLLABUS_UPLOAD_DIR", "data/uploads")
+# Total size of the store before LRU eviction (per-upload cap: limits.MAX_UPLOAD_BYTES)
+UPLOAD_STORE_MAX_BYTES = int(os.environ.get("SYLLABUS_UPLOAD_STORE_MAX_BYTES", str(2 * 1024 ** 3)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Request pins expire on their own in case the process dies before unpinning
+REQUEST_PIN_SECONDS = 3600
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256    TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_used_idx ON blobs (last_used);
+
+-- Blobs something still needs (an in-flight request, a queued/running job);
+-- eviction skips them.
+CREATE TABLE IF NOT EXISTS pins (
+    owner      TEXT PRIMARY KEY,        -- request token or job id
+    sha256     TEXT NOT NULL,
+    expires_at REAL                     -- NULL: until unpinned
+);
+CREATE INDEX IF NOT EXISTS pins_sha256_idx ON pins (sha256);
+"""
+
+@dataclass
+class StoredUpload:
+    sha256: str
+    size: int
+    deduplicated: bool = False    # True if identical bytes were already stored
+
+# ---------- Interface ----------
+class UploadStore(ABC):
+    """
+    Content-addressed storage for uploaded syllabi. Blobs are named by the
+    SHA-256 of their bytes, so storing the same file twice is a no-op.
+    Pinned blobs are never evicted. Everything here is blocking I/O; call it
+    from a threadpool in async code. A bucket-backed store implements the same
+    methods; local_path may download into a scratch cache.
+    """
+
+    @abstractmethod
+    def put(self, fileobj: BinaryIO, max_bytes: Optional[int] = None,
+            pin: Optional[str] = None, pin_ttl: Optional[float] = None) -> StoredUpload:
+        """Store fileobj's bytes (LimitExceeded past max_bytes), optionally pinned for `pin`."""
+
+    @abstractmethod
+    def pin(self, sha256: str, owner: str, ttl: Optional[float] = None):
+        """Keep the blob from eviction until unpin(owner); KeyError if it isn't stored."""
+
+    @abstractmethod
+    def unpin(self, owner: str):
+        ...
+
+    @abstractmethod
+    def size(self, sha256: str) -> int:
+        """Size in bytes from the store's own metadata; KeyError if it isn't stored."""
+
+    @abstractmethod
+    def local_path(self, sha256: str) -> str:
+        """Readable filesystem path for the blob; KeyError if it isn't stored."""
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        ...
+
+def is_sha256(value: str) -> bool:
+    return bool(SHA256_RE.match(value or ""))
+
+# ---------- Local disk ----------
+class LocalUploadStore(UploadStore):
+    """
+    Blobs live at <root>/<sha[:2]>/<sha>.pdf with a small SQLite index of
+    sizes, last-use times and pins. Once the total passes max_bytes the least
+    recently used unpinned blobs are deleted. Placing a blob, pinning it and
+    evicting all run under the index's write lock, so a blob can't disappear
+    between being stored/found and being pinned.
+    """
+
+    def __init__(self, root: str = UPLOAD_DIR, max_bytes: int = UPLOAD_STORE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(root, "index.sqlite3")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite_store.connect(self.db_path, SCHEMA)
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], f"{sha256}.pdf")
+
+    def put(self, fileobj: BinaryIO, max_bytes: Optional[int] = None,
+            pin: Optional[str] = None, pin_ttl: Optional[float] = None) -> StoredUpload:
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+        digest, size = hashlib.sha256(), 0
+        conn = self._connect()
+        try:
+            with open(tmp_path, "wb") as out:
+                while True:
+                    chunk = fileobj.read(UPLOAD_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise LimitExceeded(f"upload over {max_bytes} bytes")
+                    digest.update(chunk)
+                    out.write(chunk)
+            sha256 = digest.hexdigest()
+            final = self._blob_path(sha256)
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                deduplicated = os.path.exists(final)
+                if not deduplicated:
+                    os.makedirs(os.path.dirname(final), exist_ok=True)
+                    os.replace(tmp_path, final)
+                conn.execute(
+                    "INSERT INTO blobs (sha256, size, last_used) VALUES (?, ?, ?) "
+                    "ON CONFLICT(sha256) DO UPDATE SET last_used = excluded.last_used",
+                    (sha256, size, time.time()),
+                )
+                if pin:
+                    self._insert_pin(conn, sha256, pin, pin_ttl)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if not deduplicated:
+                self._evict(conn, keep=sha256)
+        finally:
+            conn.close()
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return StoredUpload(sha256=sha256, size=size, deduplicated=deduplicated)
+
+    def _insert_pin(self, conn: sqlite3.Connection, sha256: str, owner: str, ttl: Optional[float]):
+        conn.execute(
+            "INSERT OR REPLACE INTO pins (owner, sha256, expires_at) VALUES (?, ?, ?)",
+            (owner, sha256, time.time() + ttl if ttl else None),
+        )
+
+    def _evict(self, conn: sqlite3.Connection, keep: str):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            conn.execute("DELETE FROM pins WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total > self.max_bytes:
+                for row in conn.execute(
+                    "SELECT sha256, size FROM blobs WHERE sha256 != ? "
+                    "AND sha256 NOT IN (SELECT sha256 FROM pins) ORDER BY last_used", (keep,)
+                ).fetchall():
+                    try:
+                        os.unlink(self._blob_path(row["sha256"]))
+                    except FileNotFoundError:
+                        pass
+                    conn.execute("DELETE FROM blobs WHERE sha256 = ?", (row["sha256"],))
+                    total -= row["size"]
+                    if total <= self.max_bytes:
+                        break
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def pin(self, sha256: str, owner: str, ttl: Optional[float] = None):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if not self.exists(sha256):
+                    raise KeyError(sha256)
+                self._insert_pin(conn, sha256, owner, ttl)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def unpin(self, owner: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM pins WHERE owner = ?", (owner,))
+        finally:
+            conn.close()
+
+    def size(self, sha256: str) -> int:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT size FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        finally:
+            conn.close()
+        if row is None or not self.exists(sha256):
+            raise KeyError(sha256)
+        return row["size"]
+
+    def local_path(self, sha256: str) -> str:
+        if not self.exists(sha256):
+            raise KeyError(sha256)
+        path = self._blob_path(sha256)
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE blobs SET last_used = ? WHERE sha256 = ?", (time.time(), sha256))
+        finally:
+            conn.close()
+        return path
+
+    def exists(self, sha256: str) -> bool:
+        return is_sha256(sha256) and os.path.exists(self._blob_path(sha256))
+
+store: UploadStore = LocalUploadStore()
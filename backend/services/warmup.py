@@ -0,0 +1,25 @@
+from backend.services import date_parser, weekly_schedule
+
+# Small syllabus-shaped sample that walks every parser path once:
+# spaCy pipeline + matcher, the combined date regex, schedule/lab/office lines
+# and the ad-hoc patterns that only land in re's cache on first use.
+SAMPLE_TEXT = """PHYS 110 - Introductory Physics Fall 2025
+Lecture: MWF 10:00-10:50 AM, Room 101
+Office Hours: Tu/Th 1-2pm, Fowler 302
+Lab Sections: Sec 1 - M 2:00-4:50pm; Sec 2 - W 2:00-4:50pm (all in HSC 109)
+Discussion:
+Thursday
+3:00 pm - 3:50 pm
+Room 204
+Midterm exam on October 7, 2025
+Homework 3 due Sept 9 at 11:59pm
+Final: 12/10/2025
+"""
+
+def warm():
+    """
+    Import and exercise every module-level parser object so a forking server
+    can build them once in the master and share the pages with its workers.
+    """
+    date_parser.parse_dates(SAMPLE_TEXT)
+    weekly_schedule.parse_class_schedule(SAMPLE_TEXT)
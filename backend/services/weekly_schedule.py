@@ -1,4 +1,5 @@
 import re
+from datetime import date
 from dataclasses import dataclass, asdict
 from typing import List, Optional, Dict, Any, Tuple
 
@@ -434,6 +435,14 @@ def time_makes_sense(meeting: Meeting) -> bool:
 # ---------- Main parser ----------
 def parse_class_schedule(raw_text: str) -> CourseSchedule:
     text = normalize_text(raw_text)
+    return CourseSchedule(course_name=_guess_course_name(text), meetings=_parse_meetings(text))
+
+def _parse_meetings(text: str, min_pos: int = 0) -> List[Meeting]:
+    """
+    All meetings found in already-normalized `text`, filtered and deduped.
+    text[:min_pos] only serves as context (section headers, office-hours
+    lookback); meetings that start there are skipped.
+    """
     meetings: List[Meeting] = []
 
     # Kind spans from section headers (Office Hours:, Lab:, etc.)
@@ -441,6 +450,8 @@ def parse_class_schedule(raw_text: str) -> CourseSchedule:
 
     # ---- Pass A: explicit schedule lines in one line ----
     for m in SCHEDULE_LINE_RE.finditer(text):
+        if m.start() < min_pos:
+            continue
         # determine line bounds for classification/filters
         line_start = text.rfind("\n", 0, m.start()) + 1
         line_end = text.find("\n", m.end())
@@ -477,6 +488,8 @@ def parse_class_schedule(raw_text: str) -> CourseSchedule:
 
     # ---- Pass B: fallback line-pair stitching with positions ----
     for days_text, mt, loc, start_off, synth_line in _fallback_line_pairs_with_pos(text):
+        if start_off < min_pos:
+            continue
         if _skip_nonclass_line(synth_line):
             continue
 
@@ -500,28 +513,44 @@ def parse_class_schedule(raw_text: str) -> CourseSchedule:
     meetings = [m for m in meetings if time_makes_sense(m)]
     meetings = _dedupe_meetings(meetings)
 
-    return CourseSchedule(course_name=_guess_course_name(text), meetings=meetings)
+    return meetings
 
 # Helpers
-def meetings_to_rrule(meet: Meeting, dtstart_ymd: str) -> Dict[str, Any]:
+def meetings_to_rrule(meet: Meeting, dtstart_ymd: str,
+                      until_ymd: Optional[str] = None,
+                      exdates_ymd: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Convert one meeting pattern to a Google Calendar friendly dict:
     - BYDAY from meet.days
     - DTSTART from term start date (your choice)
+    - UNTIL end of until_ymd, EXDATE for each skipped day (both optional;
+      recurrence.meeting_recurrence fills them from a term calendar)
     """
     byday = ",".join(meet.days) or None
+    recurrence = []
+    if byday:
+        rule = f"RRULE:FREQ=WEEKLY;BYDAY={byday}"
+        if until_ymd:
+            rule += f";UNTIL={until_ymd.replace('-', '')}T235959"
+        recurrence.append(rule)
+        if exdates_ymd:
+            hms = meet.start_24h.replace(":", "") + "00"
+            recurrence.append("EXDATE:" + ",".join(f"{d.replace('-', '')}T{hms}" for d in exdates_ymd))
     return {
         "start": {"dateTime": f"{dtstart_ymd}T{meet.start_24h}:00"},
         "end":   {"dateTime": f"{dtstart_ymd}T{meet.end_24h}:00"},
-        "recurrence": [f"RRULE:FREQ=WEEKLY;BYDAY={byday}"] if byday else []
+        "recurrence": recurrence
     }
 
 def exam_window_from_schedule(item_course: str, schedule: CourseSchedule, exam_ymd: str):
     """
     Given a course name (or code) and parsed schedule, return (start_dt, end_dt)
-    for that exam date using the first matching meeting block.
+    for that exam date using the first class meeting held on that weekday
+    (falling back to the first meeting block).
     """
     if schedule.meetings:
-        m = schedule.meetings[0]
+        byday = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"][date.fromisoformat(exam_ymd).weekday()]
+        same_day = [m for m in schedule.meetings if m.kind == "CLASS" and byday in m.days]
+        m = same_day[0] if same_day else schedule.meetings[0]
         return f"{exam_ymd}T{m.start_24h}:00", f"{exam_ymd}T{m.end_24h}:00"
     return None, None
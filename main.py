@@ -1,8 +1,22 @@
 from fastapi import FastAPI
-from backend.routers import upload, parse_text, parse_weekly
+from backend.routers import upload, parse_text, parse_weekly, jobs, events
+from backend.routers.admission import UploadSizeLimitMiddleware
+from backend.services import parse_pool
 
 app = FastAPI()
+app.add_middleware(UploadSizeLimitMiddleware)
 
 app.include_router(upload.router)
 app.include_router(parse_text.router)
-app.include_router(parse_weekly.router)
\ No newline at end of file
+app.include_router(parse_weekly.router)
+app.include_router(jobs.router)
+app.include_router(events.router)
+
+# each web process forks its own small/large parse processes (see services.parse_pool)
+@app.on_event("startup")
+def start_parse_pool():
+    parse_pool.start()
+
+@app.on_event("shutdown")
+def stop_parse_pool():
+    parse_pool.shutdown()
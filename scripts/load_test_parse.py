@@ -0,0 +1,103 @@
+"""
+Overload check for the admission control on /parse and /weekly.
+
+Phase 1 sends only normal-sized syllabi; phase 2 sends the same normal stream
+while a flood of large PDFs competes for the parser. Each client behaves like
+a well-behaved caller: on 429 it sleeps for Retry-After and tries again. The
+reported latency is per logical request, from the first attempt until the
+final answer (429 retries included), with the final status and number of
+attempts, so the two phases can be compared directly.
+
+    uvicorn main:app --port 8000 &
+    python scripts/load_test_parse.py --url http://127.0.0.1:8000 --route /parse
+
+Needs httpx (not a server dependency).
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from collections import Counter
+
+import fitz
+import httpx
+
+LINE = "Week {n}: Homework {n} due Sept {d}, reading chapter {n}, quiz on 10/{d}\n"
+
+def make_pdf(pages: int, lines_per_page: int) -> bytes:
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        text = "PHYS 110 Intro Physics Fall 2025\nLecture MWF 10:00-10:50am, Room 101\n"
+        text += "".join(LINE.format(n=p * lines_per_page + i, d=i % 28 + 1) for i in range(lines_per_page))
+        page.insert_text((36, 36), text, fontsize=6)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+async def _send(client, url, pdf):
+    """One logical request: retry on 429 after Retry-After. Returns (status, attempts)."""
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            r = await client.post(url, files={"file": ("s.pdf", pdf, "application/pdf")})
+        except httpx.HTTPError as e:
+            return type(e).__name__, attempts
+        if r.status_code != 429:
+            return r.status_code, attempts
+        await asyncio.sleep(float(r.headers.get("Retry-After", "1")))
+
+async def _client_loop(client, url, pdf, stop_at, results, tag):
+    while time.perf_counter() < stop_at:
+        t0 = time.perf_counter()
+        status, attempts = await _send(client, url, pdf)
+        results.append((tag, status, attempts, time.perf_counter() - t0))
+
+async def run_phase(url, normal_pdf, heavy_pdf, seconds, normal_clients, heavy_clients):
+    results = []
+    stop_at = time.perf_counter() + seconds
+    async with httpx.AsyncClient(timeout=120) as client:
+        loops = [_client_loop(client, url, normal_pdf, stop_at, results, "normal") for _ in range(normal_clients)]
+        loops += [_client_loop(client, url, heavy_pdf, stop_at, results, "heavy") for _ in range(heavy_clients)]
+        await asyncio.gather(*loops)
+    return results
+
+def report(name, results):
+    print(f"== {name}")
+    for tag in ("normal", "heavy"):
+        rows = [r for r in results if r[0] == tag]
+        if not rows:
+            continue
+        counts = Counter(r[1] for r in rows)
+        retried = sum(1 for r in rows if r[2] > 1)
+        ms = sorted(r[3] * 1000 for r in rows)
+        line = f"  {tag:6s} n={len(rows):5d} final={dict(counts)} retried={retried}"
+        if len(ms) >= 2:
+            q = statistics.quantiles(ms, n=100)
+            line += f"  end-to-end p50={q[49]:.0f}ms p95={q[94]:.0f}ms p99={q[98]:.0f}ms max={ms[-1]:.0f}ms"
+        print(line)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--route", default="/parse")
+    ap.add_argument("--seconds", type=float, default=20)
+    ap.add_argument("--normal-clients", type=int, default=2)
+    ap.add_argument("--heavy-clients", type=int, default=8)
+    ap.add_argument("--heavy-pages", type=int, default=140)
+    args = ap.parse_args()
+
+    normal_pdf = make_pdf(pages=4, lines_per_page=40)
+    # stays under MAX_TEXT_CHARS, so every heavy request is parsed to the end
+    heavy_pdf = make_pdf(pages=args.heavy_pages, lines_per_page=80)
+    url = args.url.rstrip("/") + args.route
+
+    report("baseline (normal only)", asyncio.run(
+        run_phase(url, normal_pdf, heavy_pdf, args.seconds, args.normal_clients, 0)))
+    report("overload (normal + heavy flood)", asyncio.run(
+        run_phase(url, normal_pdf, heavy_pdf, args.seconds, args.normal_clients, args.heavy_clients)))
+
+if __name__ == "__main__":
+    main()